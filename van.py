@@ -1,64 +1,213 @@
 import os
 import re
+import time
+import random
 import asyncio
 import logging
+from logging.handlers import MemoryHandler, RotatingFileHandler
+from collections import OrderedDict
 from datetime import datetime, timezone
-from threading import Thread
 from dotenv import load_dotenv, set_key
 from telethon import TelegramClient, events
 from telethon.sessions import StringSession
-from telethon.errors import RPCError, UserAlreadyParticipantError
+from telethon.utils import get_input_peer
+from telethon.errors import (
+    RPCError, FloodWaitError, PeerIdInvalidError, UserAlreadyParticipantError
+)
 from telethon.tl.functions.messages import ImportChatInviteRequest
-from difflib import SequenceMatcher
-from flask import Flask, jsonify
+from telethon.tl.types import (
+    Message, PeerUser, UpdateEditMessage, UpdateNewMessage, UpdateShortMessage
+)
+from rapidfuzz import fuzz, process, utils
+from aiohttp import web
+
+try:
+    import uvloop  # optional: faster event loop where it's installed
+except ImportError:
+    uvloop = None
 
-# Logging
+# Logging: bot.log rotates at 5 MB and is written in batches, flushed at once on ERROR
+LOG_FORMAT = "%(asctime)s [%(levelname)s] %(message)s"
+file_handler = RotatingFileHandler('bot.log', maxBytes=5_000_000, backupCount=3, delay=True)
+# basicConfig only formats the handlers it is given, not the MemoryHandler's target
+file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
 logging.basicConfig(
     level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
+    format=LOG_FORMAT,
     handlers=[
         logging.StreamHandler(),
-        logging.FileHandler('bot.log')
+        MemoryHandler(capacity=256, flushLevel=logging.ERROR, target=file_handler)
     ]
 )
 logger = logging.getLogger(__name__)
 
-# Flask App
-app = Flask(__name__)
+# Health endpoint on the bot's event loop; the timestamp is formatted at most once a second
+health_stamp = [0, ""]
 
-@app.route('/health')
-def health():
-    return jsonify({
+async def health(request):
+    now = int(time.time())
+    if now != health_stamp[0]:
+        health_stamp[:] = [now, datetime.fromtimestamp(now, timezone.utc).isoformat()]
+    return web.json_response({
         "status": "running",
-        "timestamp": datetime.now(timezone.utc).isoformat()
+        "timestamp": health_stamp[1]
     })
 
+app = web.Application()
+app.router.add_get('/health', health)
+
 # Load env variables
 load_dotenv()
 API_ID = int(os.getenv("API_ID", "0"))
 API_HASH = os.getenv("API_HASH", "")
 TARGET_BOT = "@vankedisicoin_bot"
+TARGET_USERNAME = TARGET_BOT.lstrip("@").lower()
 NOTIFICATION_GROUP = os.getenv("GROUP_ID", "")
 SESSION_STRING = os.getenv("SESSION_STRING", "")
+DISABLE_HEALTH = os.getenv("DISABLE_HEALTH", "").strip().lower() in {"1", "true", "yes"}
 
 if not API_ID or not API_HASH or not NOTIFICATION_GROUP:
     logger.critical("Missing env variables: API_ID, API_HASH, or GROUP_ID")
     exit(1)
 
 # Globals
-last_task_count = 0
+last_tasks = {}  # task id -> task line, see parse_tasks
 last_notification_time = None
 client = None
-check_interval = 20  # seconds
+target_bot_id = None
+min_interval = 60  # seconds
+max_interval = 1800  # seconds
 max_retries = 5
-retry_delay = 2  # seconds
+retry_delay = 2  # seconds, doubled on each consecutive failure
+max_retry_delay = 60  # seconds
+stable_run = 300  # seconds a run must last before the retry backoff resets
 notification_entity = None
+last_update_time = 0.0  # time.monotonic() of the last pushed task update
+tasks_changed = asyncio.Event()  # set whenever the known task list changes
+notified_tasks = {}  # task list as of the last notification
+notification_task = None
+notification_delay = 30  # seconds
+bot_replied = asyncio.Event()  # set on every message or edit from TARGET_BOT
+bot_reply = None  # the message behind the last bot_replied
+reply_timeout = 5  # seconds
+
+class BotSession(StringSession):
+    """StringSession that only remembers the target bot's entity.
+
+    The session otherwise stores a row for every user and chat seen in updates.
+    This bot only ever looks up TARGET_BOT by username; the notification peer
+    is kept separately by resolve_notification_entity.
+    """
+
+    # Relies on Telethon 1.x MemorySession internals: _entities and _entities_to_rows()
+    def process_entities(self, tlo):
+        self._entities |= {row for row in self._entities_to_rows(tlo) if row[2] == TARGET_USERNAME}
+
+def create_client(session_string=None):
+    # Telethon retries transient failures itself; the entity cache only needs a handful of peers
+    return TelegramClient(
+        BotSession(session_string), API_ID, API_HASH,
+        connection_retries=5, retry_delay=2, auto_reconnect=True, request_retries=3,
+        entity_cache_limit=100
+    )
+
+class AdaptiveTokenBucket:
+    """Client-side rate limiter that adapts to Telegram's undisclosed flood limits.
+
+    The refill rate grows additively after each successful call and is cut
+    multiplicatively (with the bucket emptied) when Telegram returns FLOOD_WAIT.
+    """
+
+    def __init__(self, rate=1.0, capacity=2, min_rate=0.1, increase=0.05, decrease=0.5):
+        self.rate = rate  # tokens per second
+        self.capacity = capacity
+        self.min_rate = min_rate
+        self.max_rate = rate
+        self.increase = increase
+        self.decrease = decrease
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        while True:
+            wait = self.blocked_until - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+                continue
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def on_success(self):
+        self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_failure(self, retry_after=0):
+        self.rate = max(self.min_rate, self.rate * self.decrease)
+        self.tokens = 0
+        self.updated = time.monotonic()
+        self.blocked_until = max(self.blocked_until, self.updated + retry_after)
+
+bucket = AdaptiveTokenBucket()
+
+async def tg_call(func, *args, **kwargs):
+    """Call a Telethon request method once the shared token bucket allows it"""
+    await bucket.acquire()
+    try:
+        result = await func(*args, **kwargs)
+    except FloodWaitError as e:
+        bucket.on_failure(e.seconds)
+        raise
+    bucket.on_success()
+    return result
+
+# Known button labels, matched before falling back to fuzzy similarity
+BUTTON_PATTERNS = {
+    "go to task": re.compile(r"go\s*to\s*task", re.I),
+    "tasks": re.compile(r"\btasks\b", re.I),
+    "main menu": re.compile(r"main\s*menu", re.I),
+}
+
+# Screens on the way to the task list: (screen text, "" for any; button; log line)
+NAVIGATION_STEPS = (
+    ("", "main menu", "Clicked 'Main Menu' to reset bot state"),
+    ("Welcome to the vankedisi Adventure!", "go to task", "Clicked 'Go to Task Bot'"),
+    ("Task Panel", "tasks", "Entered Task Panel"),
+)
+
+# (message id, target text) -> (row, col, button text), least recently used first
+BUTTON_CACHE = OrderedDict()
+BUTTON_CACHE_SIZE = 256
 
-def similar(a, b):
-    return SequenceMatcher(None, a.lower(), b.lower()).ratio()
+# Task lists are headed TASK_LIST_TEXT, one TASK_MARKER line per task, often with a [id]
+TASK_LIST_TEXT = "Active Tasks"
+TASK_MARKER = "🔹"
+TASK_RE = re.compile(TASK_MARKER + r"[ \t]*(\[([^\]]+)\].*|.+)")
+
+# Notification texts; only formatted when a notification is actually sent
+TASKS_AVAILABLE_MSG = "🚨🚨 {count} TASKS AVAILABLE!🚨🚨\n\nNEW:\n{new}"
+NO_TASKS_MSG = "⚠️ No Tasks WAGMi "
+
+def parse_tasks(text):
+    """Return the tasks in an "Active Tasks" message as {task id: task line}.
+
+    A task is known by its bracketed id where it has one, so a countdown or
+    slot counter elsewhere on the line doesn't make it look new on every edit.
+    """
+    # Cheap membership test first; most bot messages have no marker
+    if TASK_MARKER not in text:
+        return {}
+    return {(task_id or line).strip(): line.strip() for line, task_id in TASK_RE.findall(text)}
 
 async def resolve_notification_entity():
-    """Resolve NOTIFICATION_GROUP to a proper Telethon entity"""
+    """Resolve NOTIFICATION_GROUP to an InputPeer that send_notification can reuse"""
     global notification_entity
     try:
         if NOTIFICATION_GROUP.startswith("https://t.me/+"):
@@ -66,191 +215,402 @@ async def resolve_notification_entity():
             invite_hash = NOTIFICATION_GROUP.split("+")[-1]
             try:
                 result = await client(ImportChatInviteRequest(invite_hash))
-                notification_entity = result.chats[0]
-                logger.info(f"Joined private channel: {notification_entity.title}")
+                notification_entity = get_input_peer(result.chats[0])
+                logger.info("Joined private channel: %s", result.chats[0].title)
             except UserAlreadyParticipantError:
-                # Already a participant, fallback to get_entity
-                notification_entity = await client.get_entity(NOTIFICATION_GROUP)
-                logger.info(f"Already a participant, resolved entity: {notification_entity.title if hasattr(notification_entity, 'title') else notification_entity.username}")
+                # Already a participant, fallback to get_input_entity
+                notification_entity = await client.get_input_entity(NOTIFICATION_GROUP)
+                logger.info("Already a participant, resolved entity: %s", NOTIFICATION_GROUP)
         else:
             # Public channel or group
-            notification_entity = await client.get_entity(NOTIFICATION_GROUP)
-            logger.info(f"Notification entity resolved: {notification_entity.title if hasattr(notification_entity, 'title') else notification_entity.username}")
+            notification_entity = await client.get_input_entity(NOTIFICATION_GROUP)
+            logger.info("Notification entity resolved: %s", NOTIFICATION_GROUP)
     except Exception as e:
-        logger.error(f"Failed to resolve notification entity: {e}")
+        logger.error("Failed to resolve notification entity: %s", e)
         notification_entity = None
 
+async def click_button(event, row, col):
+    try:
+        await tg_call(event.click, row, col)
+        return True
+    except FloodWaitError:
+        raise
+    except RPCError as e:
+        logger.error("Click error: %s", e)
+        return False
+
+def find_button(event, target_text, threshold):
+    """Return the (row, col) of a button matching target_text, or None"""
+    # Flatten and lowercase the keyboard once; every pass below reuses it
+    target = target_text.lower()
+    positions = [(r, c) for r, row in enumerate(event.buttons) for c in range(len(row))]
+    labels = [(btn.text or "").lower() for row in event.buttons for btn in row]
+    # An exact label always wins
+    if target in labels:
+        return positions[labels.index(target)]
+    pattern = BUTTON_PATTERNS.get(target)
+    if pattern:
+        for i, label in enumerate(labels):
+            if pattern.search(label):
+                return positions[i]
+    # Then any label containing the target verbatim
+    for i, label in enumerate(labels):
+        if target in label:
+            return positions[i]
+    # ratio() is at most 2 * shorter / (sum of lengths); drop labels that can't reach it
+    target = utils.default_process(target)
+    candidates = {}
+    for i, label in enumerate(labels):
+        label = utils.default_process(label)
+        if 2 * min(len(label), len(target)) >= threshold * (len(label) + len(target)):
+            candidates[i] = label
+    # Plain ratio, not WRatio: partial scoring lets a fragment like "Go" win for "go to task"
+    match = process.extractOne(target, candidates, scorer=fuzz.ratio, score_cutoff=threshold * 100)
+    if match is None:
+        return None
+    return positions[match[2]]
+
+def cached_button(event, target_text):
+    key = (event.id, target_text)
+    cached = BUTTON_CACHE.get(key)
+    if not cached:
+        return None
+    r, c, text = cached
+    # The bot may edit a message's keyboard in place, so check the button is unchanged
+    rows = event.buttons
+    if r < len(rows) and c < len(rows[r]) and rows[r][c].text == text:
+        BUTTON_CACHE.move_to_end(key)
+        return r, c
+    del BUTTON_CACHE[key]
+    return None
+
 async def click_button_by_relation(event, target_text, threshold=0.6):
     if not event.buttons:
         return False
-    best_score = 0
-    best_position = (0, 0)
-    for r, row in enumerate(event.buttons):
-        for c, btn in enumerate(row):
-            text = btn.text or ""
-            score = similar(text, target_text)
-            if score > best_score:
-                best_score = score
-                best_position = (r, c)
-    if best_score >= threshold:
-        try:
-            await event.click(best_position[0], best_position[1])
-            return True
-        except RPCError as e:
-            logger.error(f"Click error: {e}")
+    position = cached_button(event, target_text)
+    if position is None:
+        position = find_button(event, target_text, threshold)
+        if position is None:
             return False
-    return False
+        r, c = position
+        BUTTON_CACHE[(event.id, target_text)] = (r, c, event.buttons[r][c].text)
+        if len(BUTTON_CACHE) > BUTTON_CACHE_SIZE:
+            BUTTON_CACHE.popitem(last=False)
+    return await click_button(event, *position)
+
+async def on_bot_msg(event):
+    global bot_reply
+    bot_reply = event.message
+    bot_replied.set()
+
+async def wait_for_reply():
+    """Return the bot's next message or edit, or None after reply_timeout"""
+    try:
+        await asyncio.wait_for(bot_replied.wait(), reply_timeout)
+    except asyncio.TimeoutError:
+        logger.warning("No reply from %s after %ds", TARGET_BOT, reply_timeout)
+        return None
+    return bot_reply
 
 async def navigate_to_tasks():
+    """Click through to the task list; return the latest bot messages, or None on failure"""
     logger.info("Navigating to tasks without /start")
     try:
-        async for msg in client.iter_messages(TARGET_BOT, limit=3):
-            if await click_button_by_relation(msg, "main menu"):
-                logger.info("Clicked 'Main Menu' to reset bot state")
-                await asyncio.sleep(1)
-                break
-
-        async for msg in client.iter_messages(TARGET_BOT, limit=3):
-            if "Welcome to the vankedisi Adventure!" in msg.text:
-                if await click_button_by_relation(msg, "go to task"):
-                    logger.info("Clicked 'Go to Task Bot'")
-                    await asyncio.sleep(1)
-                break
-
-        async for msg in client.iter_messages(TARGET_BOT, limit=3):
-            if "Task Panel" in msg.text:
-                if await click_button_by_relation(msg, "tasks"):
-                    logger.info("Entered Task Panel")
-                    await asyncio.sleep(1)
-                    return True
+        # Fetch the chat once; later screens come from the bot's pushed replies
+        msgs = await tg_call(client.get_messages, TARGET_BOT, limit=5)
+        clicked = False
+        for screen_text, button, description in NAVIGATION_STEPS:
+            clicked = False
+            for msg in msgs:
+                # Service messages and media have no text
+                if screen_text not in (msg.raw_text or ""):
+                    continue
+                # Clear before clicking so only the answer to this click counts
+                bot_replied.clear()
+                if await click_button_by_relation(msg, button):
+                    logger.info(description)
+                    clicked = True
+                    break
+            if clicked:
+                # Move on as soon as the bot answers instead of sleeping a fixed time
+                reply = await wait_for_reply()
+                if reply:
+                    msgs = [reply] + msgs
+                else:
+                    msgs = await tg_call(client.get_messages, TARGET_BOT, limit=5)
 
+        if clicked:
+            return msgs
         logger.warning("Failed to reach Task Panel")
-        return False
+        return None
+    except FloodWaitError:
+        raise
     except Exception as e:
-        logger.error(f"Navigation error: {e}")
-        return False
+        logger.error("Navigation error: %s", e)
+        return None
 
-async def get_task_count():
+async def get_tasks():
+    """Return the current tasks (see parse_tasks), or None if the task list couldn't be read"""
     try:
-        if not await navigate_to_tasks():
-            return 0
-        async for msg in client.iter_messages(TARGET_BOT, limit=1):
-            if "Active Tasks" in msg.text:
-                count = msg.text.count("🔹")
-                logger.info(f"Found {count} tasks")
-                return count
+        msgs = await navigate_to_tasks()
+        if not msgs:
+            return None
+        # raw_text, as in on_task_update, so both paths parse the same lines
+        text = msgs[0].raw_text or ""
+        if TASK_LIST_TEXT in text:
+            tasks = parse_tasks(text)
+            logger.info("Found %d tasks", len(tasks))
+            return tasks
+    except FloodWaitError:
+        raise
     except Exception as e:
-        logger.error(f"Task count error: {e}")
-    return 0
+        logger.error("Task count error: %s", e)
+    return None
 
 async def send_notification(msg):
-    global notification_entity
     if not notification_entity:
         await resolve_notification_entity()
-    if notification_entity:
+    if not notification_entity:
+        logger.error("Cannot send notification, entity not resolved.")
+        return
+    resolved_again = False
+    while True:
         try:
-            await client.send_message(notification_entity, msg)
+            await tg_call(client.send_message, notification_entity, msg)
+        except FloodWaitError as e:
+            logger.warning("FLOOD_WAIT %ds while sending notification", e.seconds)
+            await asyncio.sleep(e.seconds + random.uniform(1, 5))
+            continue
+        except (ValueError, PeerIdInvalidError) as e:
+            # The cached peer went stale; resolve it once more before giving up
+            if not resolved_again:
+                logger.warning("Notification peer rejected (%s), resolving it again", e)
+                resolved_again = True
+                await resolve_notification_entity()
+                if notification_entity:
+                    continue
+            logger.error("Notification failed: %s", e)
         except Exception as e:
-            logger.error(f"Notification failed: {e}")
+            logger.error("Notification failed: %s", e)
+        break
+
+async def update_tasks(tasks):
+    global last_tasks, notification_task
+    previous = last_tasks
+    last_tasks = tasks
+    if tasks.keys() == previous.keys():
+        return
+    tasks_changed.set()
+    if notification_task is None or notification_task.done():
+        notification_task = asyncio.create_task(flush_notification())
+
+async def flush_notification():
+    """Announce the net task change after letting a burst of updates settle"""
+    global notified_tasks, last_notification_time
+    while True:
+        # The list often flaps while the bot refreshes; only the final state is sent
+        await asyncio.sleep(notification_delay)
+        tasks, previous = last_tasks, notified_tasks
+        notified_tasks = tasks
+        # Compare task ids, not counts; expiries alone stay quiet
+        new_tasks = tasks.keys() - previous.keys()
+        if new_tasks:
+            new_lines = "\n".join(f"{TASK_MARKER} {tasks[task]}" for task in sorted(new_tasks))
+            await send_notification(TASKS_AVAILABLE_MSG.format(count=len(tasks), new=new_lines))
+            last_notification_time = datetime.now(timezone.utc)
+        elif not tasks and previous:
+            await send_notification(NO_TASKS_MSG)
+        # Go round again for changes that arrived during the send
+        if last_tasks.keys() == notified_tasks.keys():
+            return
+
+async def on_task_update(update):
+    """Handle an "Active Tasks" message posted or edited by the target bot.
+
+    Registered as a Raw handler: the text is read straight off the MTProto
+    update, without building Telethon's Message wrapper around it.
+    """
+    global last_update_time
+    if isinstance(update, UpdateShortMessage):
+        if update.out or update.user_id != target_bot_id:
+            return
+        text = update.message
     else:
-        logger.error("Cannot send notification, entity not resolved.")
+        message = update.message
+        if (not isinstance(message, Message) or message.out
+                or not isinstance(message.peer_id, PeerUser)
+                or message.peer_id.user_id != target_bot_id):
+            return
+        text = message.message
+    if TASK_LIST_TEXT not in text:
+        return
+    last_update_time = time.monotonic()
+    tasks = parse_tasks(text)
+    logger.info("Task update received: %d tasks", len(tasks))
+    await update_tasks(tasks)
+
+async def register_handlers():
+    global target_bot_id
+    target_bot_id = await client.get_peer_id(TARGET_BOT)
+    # reconnect() usually keeps the same client, so drop any earlier registration first
+    client.remove_event_handler(on_task_update)
+    client.remove_event_handler(on_bot_msg)
+    # The bot often refreshes the Task Panel by editing it in place
+    client.add_event_handler(
+        on_task_update,
+        events.Raw(types=[UpdateNewMessage, UpdateEditMessage, UpdateShortMessage])
+    )
+    for event_type in (events.NewMessage, events.MessageEdited):
+        client.add_event_handler(on_bot_msg, event_type(chats=TARGET_BOT))
 
 async def monitor():
-    global last_task_count, last_notification_time
+    # Watchdog: re-open the Task Panel after a quiet interval, which doubles while nothing changes
+    await register_handlers()
+    interval = min_interval
     while True:
         try:
-            count = await get_task_count()
-            if count > 0 and count != last_task_count:
-                msg = f"🚨🚨 {count} TASKS AVAILABLE!🚨🚨"
-                await send_notification(msg)
-                last_notification_time = datetime.now(timezone.utc)
-                last_task_count = count
-            elif count == 0 and last_task_count > 0:
-                await send_notification("⚠️ No Tasks WAGMi ")
-                last_task_count = 0
+            if time.monotonic() - last_update_time >= interval:
+                # on_task_update may apply the result first, so compare with the list from before
+                before = last_tasks
+                tasks = await get_tasks()
+                if tasks is not None:
+                    await update_tasks(tasks)
+                if last_tasks.keys() == before.keys():
+                    interval = min(interval * 2, max_interval)
+                else:
+                    interval = min_interval
+        except FloodWaitError as e:
+            logger.warning("FLOOD_WAIT %ds", e.seconds)
+            await asyncio.sleep(e.seconds + random.uniform(1, 5))
+            continue
         except Exception as e:
-            logger.error(f"Monitor loop error: {e}")
-            await reconnect()
-        await asyncio.sleep(check_interval)
+            # Lost connections surface through watch_connection(), not here
+            logger.error("Monitor loop error: %s", e)
+        # Wait for the next heartbeat (with jitter); any change restarts it at min_interval
+        while True:
+            try:
+                await asyncio.wait_for(tasks_changed.wait(), interval * random.uniform(0.75, 1.25))
+            except asyncio.TimeoutError:
+                break
+            tasks_changed.clear()
+            interval = min_interval
+
+async def watch_connection():
+    # Telethon reconnects transient drops on its own; this only fires once it gives up
+    await client.disconnected
+    raise ConnectionError("Telegram client disconnected")
+
+async def run_monitor():
+    """Run monitor() until the client drops, then surface the failure to start_bot"""
+    try:
+        # Whichever task fails first cancels the other
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(monitor())
+            tg.create_task(watch_connection())
+    except ExceptionGroup as eg:
+        raise eg.exceptions[0]
+
+def backoff_delay(attempt):
+    # Exponential backoff with jitter, so retries from several clients don't line up
+    return min(retry_delay * 2 ** attempt + random.uniform(0, 1), max_retry_delay)
 
 async def reconnect():
     global client
     for attempt in range(max_retries):
         try:
-            logger.info(f"Attempting to reconnect (attempt {attempt + 1}/{max_retries})")
-            if client and client.is_connected():
-                await client.disconnect()
-
-            if SESSION_STRING:
-                client = TelegramClient(StringSession(SESSION_STRING), API_ID, API_HASH)
-            else:
-                client = TelegramClient(StringSession(), API_ID, API_HASH)
-
-            await client.connect()
+            logger.info("Attempting to reconnect (attempt %d/%d)", attempt + 1, max_retries)
+            # Reuse the existing client so its auth key and DC stay valid
+            if client is None:
+                client = create_client(SESSION_STRING)
+            if not client.is_connected():
+                await client.connect()
 
             if not await client.is_user_authorized():
                 logger.error("Reconnect failed - not authorized")
                 continue
 
             me = await client.get_me()
-            logger.info(f"Reconnected successfully as {me.first_name}")
+            logger.info("Reconnected successfully as %s", me.first_name)
             return True
 
         except Exception as e:
-            logger.error(f"Reconnect attempt {attempt + 1} failed: {e}")
-            await asyncio.sleep(retry_delay)
+            logger.error("Reconnect attempt %d failed: %s", attempt + 1, e)
+            await asyncio.sleep(backoff_delay(attempt))
 
     logger.critical("Failed to reconnect after multiple attempts")
     return False
 
+async def start_health_server():
+    # Health probes arrive every few seconds; don't write an access log line for each
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "0.0.0.0", 5000).start()
+    logger.info("Health endpoint listening on port 5000")
+
 async def start_bot():
-    global client
+    global client, SESSION_STRING
+    if not DISABLE_HEALTH:
+        await start_health_server()
+    failures = 0
+    resume = False  # True once reconnect() has brought the current client back
     while True:
+        started = time.monotonic()
         try:
-            logger.info("Starting bot...")
-            if not SESSION_STRING:
-                client = TelegramClient(StringSession(), API_ID, API_HASH)
-                await client.start()
-                set_key('.env', 'SESSION_STRING', client.session.save())
+            if resume:
+                resume = False
             else:
-                client = TelegramClient(StringSession(SESSION_STRING), API_ID, API_HASH)
-                await client.start()
+                logger.info("Starting bot...")
+                if client is not None:
+                    # Never run two connections on the same auth key
+                    await client.disconnect()
+                if not SESSION_STRING:
+                    client = create_client()
+                    await client.start()
+                    # Keep the new session in memory too, so restarts don't prompt again
+                    SESSION_STRING = client.session.save()
+                    # set_key rewrites the whole file; keep that disk I/O off the event loop
+                    await asyncio.to_thread(set_key, '.env', 'SESSION_STRING', SESSION_STRING)
+                else:
+                    client = create_client(SESSION_STRING)
+                    await client.start()
 
-            me = await client.get_me()
-            logger.info(f"Bot started as {me.first_name} (@{me.username})")
+                me = await client.get_me()
+                logger.info("Bot started as %s (@%s)", me.first_name, me.username)
 
-            # Resolve notification entity
-            await resolve_notification_entity()
+            # Resolve notification entity once; send_notification re-resolves it if rejected
+            if not notification_entity:
+                await resolve_notification_entity()
 
             # Start monitoring
-            await monitor()
+            await run_monitor()
 
         except (RPCError, ConnectionError, OSError) as e:
-            logger.error(f"Connection error: {e}. Attempting to reconnect...")
-            if not await reconnect():
+            logger.error("Connection error: %s. Attempting to reconnect...", e)
+            # On success, carry on with the reconnected client
+            resume = await reconnect()
+            if not resume:
                 logger.error("Reconnection failed. Restarting bot...")
-                await asyncio.sleep(retry_delay)
-                continue
 
         except Exception as e:
-            logger.error(f"Unexpected error in main loop: {e}")
-            logger.info("Restarting bot in 30 seconds...")
-            await asyncio.sleep(retry_delay)
-            continue
+            logger.error("Unexpected error in main loop: %s", e)
+
+        # Back off on every retry; only a run that lasted a while resets the delay
+        if time.monotonic() - started >= stable_run:
+            failures = 0
+        delay = backoff_delay(failures)
+        failures += 1
+        logger.info("Retrying in %.0f seconds...", delay)
+        await asyncio.sleep(delay)
 
 def run_bot():
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
+    if uvloop:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     try:
-        loop.run_until_complete(start_bot())
+        asyncio.run(start_bot())
     except KeyboardInterrupt:
         logger.info("Bot stopped by user")
     except Exception as e:
-        logger.error(f"Fatal error in bot thread: {e}")
-    finally:
-        loop.close()
+        logger.error("Fatal error in bot: %s", e)
 
 if __name__ == '__main__':
-    bot_thread = Thread(target=run_bot, daemon=True)
-    bot_thread.start()
-    app.run(host="0.0.0.0", port=5000)
\ No newline at end of file
+    run_bot()